@@ -0,0 +1,148 @@
+import numpy as np
+import pandas as pd
+
+from metrics import add_metrics
+
+ROLLING_WINDOW = 7
+ANOMALY_Z = 2.5
+VOLATILITY_THRESHOLD = 1.0
+TREND_THRESHOLD = 0.1
+OVERALL_CHANGE_THRESHOLD = 0.05
+MAX_ITEMS = 3
+MAX_NAMES = 3
+
+def daily_frame(df):
+    daily = (add_metrics(df.copy(), names=['互动数'])
+             .assign(日期=lambda d: pd.to_datetime(d['日期']))
+             .sort_values(['账号名称', '日期'], kind='stable')
+             .groupby(['账号名称', '日期'], sort=False)
+             .agg(粉丝量=('粉丝量', 'last'), 涨粉量=('涨粉量', 'sum'),
+                  互动数=('互动数', 'sum'), 播放量=('播放量', 'sum'))
+             .reset_index())
+    return add_metrics(daily, names=['互动率'])
+
+def analyze_accounts(df, window=ROLLING_WINDOW, anomaly_z=ANOMALY_Z):
+    """对所有账号一次性做分组滚动计算，返回账号级指标和异常日。"""
+    daily = daily_frame(df)
+    g = daily.groupby('账号名称', sort=False)
+
+    rolling_gain = g['涨粉量'].rolling(window, min_periods=1).sum().reset_index(level=0, drop=True)
+    base_fans = g['粉丝量'].shift(window).fillna(g['粉丝量'].transform('first'))
+    daily['滚动增速'] = rolling_gain / base_fans.where(base_fans != 0)
+
+    x = g.cumcount().astype(float)
+    n = g['日期'].transform('size').astype(float)
+    y = daily['互动率']
+    sums = pd.DataFrame({'账号名称': daily['账号名称'], 'x': x, 'y': y, 'xy': x * y, 'xx': x * x}).groupby('账号名称', sort=False).sum()
+    count = g.size()
+    denom = (count * sums['xx'] - sums['x'] ** 2).replace(0, np.nan)
+    slope = (count * sums['xy'] - sums['x'] * sums['y']) / denom
+    mean_rate = (sums['y'] / count).replace(0, np.nan)
+
+    second_half = x >= n / 2
+    halves = daily.assign(后半期=second_half).groupby(['账号名称', '后半期'], sort=False)[['涨粉量', '互动数']].sum().unstack('后半期')
+    halves = halves.reindex(columns=pd.MultiIndex.from_product([['涨粉量', '互动数'], [False, True]]), fill_value=0)
+
+    def pop(metric):
+        first = halves[(metric, False)]
+        return ((halves[(metric, True)] - first) / first.abs().replace(0, np.nan)).where(count >= 2)
+
+    stats = g['涨粉量'].agg(['sum', 'mean', 'std'])
+    accounts = pd.DataFrame({
+        '涨粉': stats['sum'],
+        '最新增速': daily.groupby('账号名称', sort=False)['滚动增速'].last(),
+        '涨粉波动': stats['std'] / stats['mean'].abs().clip(lower=1),
+        '互动率趋势': slope * count / mean_rate,
+        '涨粉环比': pop('涨粉量'),
+        '互动环比': pop('互动数'),
+    })
+
+    zscores = []
+    for metric in ('涨粉量', '互动数'):
+        mean = g[metric].transform('mean')
+        std = g[metric].transform('std').replace(0, np.nan)
+        z = (daily[metric] - mean) / std
+        flagged = z.abs() >= anomaly_z
+        zscores.append(pd.DataFrame({
+            '账号名称': daily.loc[flagged, '账号名称'],
+            '日期': daily.loc[flagged, '日期'].dt.strftime('%Y-%m-%d'),
+            '指标': metric,
+            '数值': daily.loc[flagged, metric],
+            'z': z[flagged],
+        }))
+    anomalies = pd.concat(zscores, ignore_index=True)
+
+    totals = halves[count >= 2].sum()
+    overall = {}
+    for metric, key in (('涨粉量', '涨粉环比'), ('互动数', '互动环比')):
+        first = totals[(metric, False)]
+        overall[key] = (totals[(metric, True)] - first) / abs(first) if first else np.nan
+    return {'accounts': accounts, 'anomalies': anomalies, 'overall': overall}
+
+def join_names(names):
+    names = list(names)
+    text = "、".join(f"「{name}」" for name in names[:MAX_NAMES])
+    if len(names) > MAX_NAMES:
+        text += f"等{len(names)}个账号"
+    return text
+
+def numbered(items, fallback):
+    items = items[:MAX_ITEMS] or [fallback]
+    return [f"{i}. {item}" for i, item in enumerate(items, 1)]
+
+def build_summary(findings):
+    accounts = findings['accounts']
+    anomalies = findings['anomalies']
+    overall = findings['overall']
+    highlights, problems, suggestions = [], [], []
+
+    if not accounts.empty:
+        top = accounts['涨粉'].idxmax()
+        growth = accounts.loc[top, '最新增速']
+        rate = f"，近{ROLLING_WINDOW}日增速 {growth:.2%}" if pd.notna(growth) else ""
+        highlights.append(f"「{top}」本期涨粉 {int(accounts.loc[top, '涨粉']):,}{rate}，领跑账号矩阵")
+        suggestions.append(f"总结「{top}」的内容模式，向其他账号复用推广")
+
+    rising = accounts['互动率趋势'][accounts['互动率趋势'] > TREND_THRESHOLD].sort_values(ascending=False)
+    if not rising.empty:
+        highlights.append(f"{join_names(rising.index)}互动率呈上升趋势")
+
+    if pd.notna(overall['互动环比']) and overall['互动环比'] > OVERALL_CHANGE_THRESHOLD:
+        highlights.append(f"整体互动数后半期较前半期增长 {overall['互动环比']:.1%}")
+
+    spikes = anomalies[anomalies['z'] > 0].sort_values('z', ascending=False)
+    if not spikes.empty:
+        spike = spikes.iloc[0]
+        highlights.append(f"「{spike['账号名称']}」{spike['日期']} {spike['指标']}异常突出（{int(spike['数值']):,}）")
+        suggestions.append(f"复盘「{spike['账号名称']}」{spike['日期']} 的作品，沉淀可复制的爆款经验")
+
+    volatile = accounts['涨粉波动'][accounts['涨粉波动'] > VOLATILITY_THRESHOLD].sort_values(ascending=False)
+    if not volatile.empty:
+        problems.append(f"{join_names(volatile.index)}涨粉波动较大，稳定性有待提升")
+        suggestions.append(f"为{join_names(volatile.index)}制定固定发布计划，保持内容更新节奏")
+
+    falling = accounts['互动率趋势'][accounts['互动率趋势'] < -TREND_THRESHOLD].sort_values()
+    if not falling.empty:
+        problems.append(f"{join_names(falling.index)}互动率呈下降趋势")
+        suggestions.append(f"针对{join_names(falling.index)}优化选题，加强评论区互动引导")
+
+    declining = accounts['涨粉环比'][accounts['涨粉环比'] < 0].sort_values()
+    if not declining.empty:
+        problems.append(f"{join_names(declining.index)}后半期涨粉较前半期下滑")
+        suggestions.append(f"对比{join_names(declining.index)}前后半期的内容差异，及时调整方向")
+
+    if pd.notna(overall['互动环比']) and overall['互动环比'] < -OVERALL_CHANGE_THRESHOLD:
+        problems.append(f"整体互动数后半期较前半期下降 {-overall['互动环比']:.1%}")
+
+    drops = anomalies[anomalies['z'] < 0].sort_values('z')
+    if not drops.empty:
+        drop = drops.iloc[0]
+        problems.append(f"「{drop['账号名称']}」{drop['日期']} {drop['指标']}异常偏低")
+
+    lines = ["【亮点】"] + numbered(highlights, "各账号整体表现平稳")
+    lines += ["", "【问题】"] + numbered(problems, "本期未发现明显问题")
+    lines += ["", "【建议】"] + numbered(suggestions, "保持当前内容节奏，持续产出优质内容")
+    return "\n".join(lines)
+
+def summarize(df):
+    return build_summary(analyze_accounts(df))
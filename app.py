@@ -1,16 +1,18 @@
 import streamlit as st
 import pandas as pd
 import os
-import tempfile
+from datetime import date
+from streamlit.runtime import Runtime
+from streamlit.runtime.scriptrunner import get_script_run_ctx
 
 from data_processor import generate_sample_data, load_data, map_columns
-from chart_generator import (
-    create_overview_chart, 
-    create_account_detail_charts, 
-    create_top_posts_chart, 
-    create_comparison_charts
-)
-from report_builder import build_ppt, build_word
+from metrics import add_metrics, parse_metric_definitions
+from pipeline import generate_reports
+from artifact_cache import ArtifactCache, make_cache_key
+from dashboard import build_aggregates, render_dashboard
+from session_manager import SessionResourceManager
+
+REPORT_FILES = ("douyin_report.pptx", "douyin_report.docx")
 
 st.set_page_config(
     page_title="抖音运营分析报告生成器",
@@ -18,6 +20,26 @@ st.set_page_config(
     layout="wide"
 )
 
+@st.cache_resource
+def get_artifact_cache():
+    return ArtifactCache()
+
+def session_exists(session_id):
+    if not Runtime.exists():
+        return True
+    # 断线的会话保留在 Streamlit 的会话存储中等待重连，get_session_info 仍能查到
+    session_mgr = getattr(Runtime.instance(), '_session_mgr', None)
+    return session_mgr is None or session_mgr.get_session_info(session_id) is not None
+
+@st.cache_resource
+def get_session_manager():
+    manager = SessionResourceManager(session_exists=session_exists)
+    manager.start_janitor()
+    return manager
+
+session_manager = get_session_manager()
+session_id = get_script_run_ctx().session_id
+
 st.title("📊 多账号抖音运营全方位分析报告生成器")
 st.markdown("---")
 
@@ -25,19 +47,17 @@ st.sidebar.header("数据输入")
 use_sample = st.sidebar.button("📋 使用示例数据")
 uploaded_file = st.sidebar.file_uploader("上传数据文件 (.xlsx 或 .csv)", type=['xlsx', 'csv'])
 
-if 'df' not in st.session_state:
-    st.session_state.df = None
-if 'output_dir' not in st.session_state:
-    st.session_state.output_dir = None
-
 if use_sample:
-    st.session_state.df = generate_sample_data()
+    session_manager.set_df(session_id, generate_sample_data())
     st.sidebar.success("✅ 示例数据已加载！")
 
 if uploaded_file is not None and not use_sample:
     try:
-        df_uploaded = load_data(uploaded_file)
-        st.session_state.df = df_uploaded
+        # 只在上传了新文件时读取，避免每次重跑都重新解析和计算数据指纹
+        if st.session_state.get('uploaded_file_id') != uploaded_file.file_id or not session_manager.has_df(session_id):
+            session_manager.set_df(session_id, load_data(uploaded_file))
+            st.session_state.uploaded_file_id = uploaded_file.file_id
+        df_uploaded = session_manager.get_df(session_id)
         
         standard_cols = ["账号名称", "日期", "作品标题", "粉丝量", "涨粉量", 
                          "点赞数", "评论数", "分享数", "收藏数", "播放量"]
@@ -51,14 +71,36 @@ if uploaded_file is not None and not use_sample:
                     column_mapping[st.sidebar.selectbox(f"将哪一列映射为 '{std_col}'", df_uploaded.columns)] = std_col
             
             if st.sidebar.button("确认映射"):
-                st.session_state.df = map_columns(df_uploaded, column_mapping)
+                session_manager.set_df(session_id, map_columns(df_uploaded, column_mapping))
                 st.sidebar.success("✅ 列映射完成！")
         
     except Exception as e:
         st.sidebar.error(f"❌ 加载文件失败: {str(e)}")
 
-if st.session_state.df is not None:
-    df = st.session_state.df
+custom_metrics = {}
+with st.sidebar.expander("🧮 自定义指标"):
+    metric_text = st.text_area(
+        "每行一个「名称 = 表达式」，可引用数据列和已有指标",
+        placeholder="千次播放点赞数 = 点赞数 * 1000 / (播放量 + (播放量 == 0))"
+    )
+    try:
+        custom_metrics = parse_metric_definitions(metric_text)
+    except ValueError as e:
+        st.error(str(e))
+
+with st.sidebar.expander("🧹 资源使用"):
+    usage = session_manager.usage()
+    cache_usage = get_artifact_cache().usage()
+    st.caption(f"活跃会话：{usage['sessions']}（已落盘 {usage['spilled']}）")
+    for error in usage['spill_errors']:
+        st.warning(f"有会话数据无法落盘，仍占用内存：{error}")
+    st.caption(f"内存：{usage['memory_bytes'] / 2**20:.1f} / {usage['memory_budget'] / 2**20:.0f} MB")
+    st.caption(f"临时文件：{usage['disk_bytes'] / 2**20:.1f} / {usage['disk_budget'] / 2**20:.0f} MB")
+    st.caption(f"报告缓存：{cache_usage['entries']} 份，{cache_usage['bytes'] / 2**20:.1f} / {cache_usage['max_bytes'] / 2**20:.0f} MB")
+
+if session_manager.has_df(session_id):
+    df = session_manager.get_df(session_id)
+    fingerprint = session_manager.fingerprint(session_id)
     
     st.subheader("📅 日期范围选择")
     df['日期'] = pd.to_datetime(df['日期'])
@@ -74,6 +116,13 @@ if st.session_state.df is not None:
     
     df_filtered = df[(df['日期'] >= start_date) & (df['日期'] <= end_date)].copy()
     df_filtered['日期'] = df_filtered['日期'].dt.strftime('%Y-%m-%d')
+    try:
+        add_metrics(df_filtered, definitions=custom_metrics)
+    except Exception as e:
+        st.error(f"❌ 指标计算失败: {str(e)}")
+    
+    st.subheader("📈 数据看板")
+    render_dashboard(build_aggregates(df, fingerprint), start_date, end_date)
     
     with st.expander("📋 数据预览"):
         st.dataframe(df_filtered.head(10))
@@ -83,32 +132,26 @@ if st.session_state.df is not None:
         status_text = st.empty()
         
         try:
-            if st.session_state.output_dir is None:
-                st.session_state.output_dir = tempfile.mkdtemp()
-            
-            status_text.text("Processing...")
-            progress_bar.progress(10)
-            
-            status_text.text("Generating Charts...")
-            create_overview_chart(df_filtered, st.session_state.output_dir)
-            progress_bar.progress(20)
-            
-            accounts = df_filtered['账号名称'].unique()
-            for i, account in enumerate(accounts):
-                create_account_detail_charts(df_filtered, account, st.session_state.output_dir)
-                progress_bar.progress(20 + (i + 1) * 8)
-            
-            create_top_posts_chart(df_filtered, st.session_state.output_dir)
-            progress_bar.progress(75)
-            
-            create_comparison_charts(df_filtered, st.session_state.output_dir)
-            progress_bar.progress(85)
+            artifact_cache = get_artifact_cache()
+            cache_key = make_cache_key(fingerprint, start_date, end_date, {'report_date': date.today().isoformat()})
+            artifacts = artifact_cache.get(cache_key, REPORT_FILES)
             
-            status_text.text("Building PPT...")
-            ppt_path = build_ppt(df_filtered, st.session_state.output_dir)
-            progress_bar.progress(92)
+            if artifacts is None:
+                output_dir = session_manager.output_dir(session_id)
+                
+                status_text.text("Generating Charts & Building Reports...")
+                progress_bar.progress(10)
+                
+                def on_stage_done(name, done, total):
+                    progress_bar.progress(10 + int(done / total * 85))
+                
+                ppt_path, word_path = generate_reports(df_filtered, output_dir, on_stage_done)
+                session_manager.record_artifacts(session_id)
+                artifacts = artifact_cache.put(cache_key, {
+                    "douyin_report.pptx": ppt_path,
+                    "douyin_report.docx": word_path
+                })
             
-            word_path = build_word(df_filtered, st.session_state.output_dir)
             progress_bar.progress(100)
             
             status_text.text("✅ 报告生成完成！")
@@ -120,22 +163,20 @@ if st.session_state.df is not None:
             col1, col2, col3 = st.columns(3)
             
             with col1:
-                with open(ppt_path, "rb") as file:
-                    st.download_button(
-                        label="📥 下载 PPTX",
-                        data=file,
-                        file_name="douyin_report.pptx",
-                        mime="application/vnd.openxmlformats-officedocument.presentationml.presentation"
-                    )
+                st.download_button(
+                    label="📥 下载 PPTX",
+                    data=artifacts["douyin_report.pptx"],
+                    file_name="douyin_report.pptx",
+                    mime="application/vnd.openxmlformats-officedocument.presentationml.presentation"
+                )
             
             with col2:
-                with open(word_path, "rb") as file:
-                    st.download_button(
-                        label="📥 下载 Word",
-                        data=file,
-                        file_name="douyin_report.docx",
-                        mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
-                    )
+                st.download_button(
+                    label="📥 下载 Word",
+                    data=artifacts["douyin_report.docx"],
+                    file_name="douyin_report.docx",
+                    mime="application/vnd.openxmlformats-officedocument.wordprocessingml.document"
+                )
             
             with col3:
                 st.info("PDF 下载功能需要在本地安装 Microsoft PowerPoint，暂不支持在云端直接生成")
@@ -0,0 +1,145 @@
+import hashlib
+import json
+import os
+import shutil
+import tempfile
+import threading
+import time
+
+import pandas as pd
+
+CACHE_DIR = os.path.join(tempfile.gettempdir(), 'douyin_report_cache')
+MAX_CACHE_BYTES = 512 * 1024 * 1024
+STAGING_TTL = 3600
+# 报告内容或格式变化时递增，使旧版本生成的缓存失效
+CACHE_VERSION = 2
+
+def data_fingerprint(df):
+    h = hashlib.sha256()
+    h.update(json.dumps([[str(col), str(dtype)] for col, dtype in df.dtypes.items()], ensure_ascii=False).encode('utf-8'))
+    h.update(pd.util.hash_pandas_object(df, index=False).values.tobytes())
+    return h.hexdigest()
+
+def make_cache_key(fingerprint, start_date, end_date, options=None):
+    payload = {
+        'version': CACHE_VERSION,
+        'data': fingerprint,
+        'start': str(start_date),
+        'end': str(end_date),
+        'options': options or {},
+    }
+    return hashlib.sha256(json.dumps(payload, sort_keys=True, ensure_ascii=False, default=str).encode('utf-8')).hexdigest()
+
+def dir_size(path):
+    total = 0
+    for dirpath, _, filenames in os.walk(path):
+        for name in filenames:
+            try:
+                total += os.path.getsize(os.path.join(dirpath, name))
+            except OSError:
+                continue
+    return total
+
+class ArtifactCache:
+    """跨会话共享的报告产物缓存，按 LRU 淘汰，磁盘占用不超过 max_bytes。
+
+    条目的大小和最近访问时间记录在内存索引中，只在启动时扫描一次目录。
+    """
+
+    def __init__(self, root=CACHE_DIR, max_bytes=MAX_CACHE_BYTES):
+        self.root = root
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        self._index = {}
+        self._pinned = {}
+        self._bytes = 0
+        os.makedirs(root, exist_ok=True)
+        self._load_index()
+
+    def _entry_dir(self, key):
+        return os.path.join(self.root, key)
+
+    def _load_index(self):
+        now = time.time()
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            try:
+                if name.startswith('.staging-'):
+                    if now - os.path.getmtime(path) > STAGING_TTL:
+                        shutil.rmtree(path, ignore_errors=True)
+                    continue
+                size = dir_size(path)
+                self._index[path] = [os.path.getmtime(path), size]
+                self._bytes += size
+            except OSError:
+                continue
+
+    def get(self, key, names):
+        entry = self._entry_dir(key)
+        with self._lock:
+            if entry not in self._index:
+                return None
+            self._index[entry][0] = time.time()
+            self._pinned[entry] = self._pinned.get(entry, 0) + 1
+        # 读取期间条目被标记为使用中，evict 会跳过它，因此无需持锁读盘
+        try:
+            artifacts = {}
+            for name in names:
+                with open(os.path.join(entry, name), 'rb') as f:
+                    artifacts[name] = f.read()
+            return artifacts
+        except OSError:
+            return None
+        finally:
+            with self._lock:
+                self._pinned[entry] -= 1
+                if not self._pinned[entry]:
+                    del self._pinned[entry]
+                over_budget = self._bytes > self.max_bytes
+            if over_budget:
+                self.evict()
+
+    def put(self, key, paths):
+        artifacts = {}
+        staging = tempfile.mkdtemp(prefix='.staging-', dir=self.root)
+        for name, path in paths.items():
+            with open(path, 'rb') as f:
+                artifacts[name] = f.read()
+            with open(os.path.join(staging, name), 'wb') as f:
+                f.write(artifacts[name])
+        size = sum(len(data) for data in artifacts.values())
+        entry = self._entry_dir(key)
+        with self._lock:
+            try:
+                os.rename(staging, entry)
+            except OSError:
+                # 其他会话已写入相同的结果
+                shutil.rmtree(staging, ignore_errors=True)
+            else:
+                self._index[entry] = [time.time(), size]
+                self._bytes += size
+        self.evict()
+        return artifacts
+
+    def evict(self):
+        victims = []
+        with self._lock:
+            for entry, (_, size) in sorted(self._index.items(), key=lambda item: item[1][0]):
+                if self._bytes <= self.max_bytes:
+                    break
+                if entry in self._pinned:
+                    continue
+                del self._index[entry]
+                self._bytes -= size
+                victims.append(entry)
+        # 已移出索引的条目不会再被 get 读到，删除目录无需持锁
+        for entry in victims:
+            shutil.rmtree(entry, ignore_errors=True)
+
+    def usage(self):
+        with self._lock:
+            return {
+                'entries': len(self._index),
+                'bytes': self._bytes,
+                'max_bytes': self.max_bytes,
+            }
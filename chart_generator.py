@@ -1,37 +1,50 @@
-import matplotlib.pyplot as plt
+from matplotlib.figure import Figure
+from matplotlib.text import Text
+from matplotlib.ticker import ScalarFormatter
 import matplotlib.font_manager as fm
 import seaborn as sns
 import pandas as pd
 import os
 
-def setup_matplotlib():
-    plt.rcParams['axes.unicode_minus'] = False
-    
+from image_pipeline import placement_dpi, optimize_png
+
+def find_font_family():
     chinese_fonts = ['Source Han Sans SC', 'Microsoft YaHei', 'SimHei', 'WenQuanYi Micro Hei']
-    font_path = None
-    for font in chinese_fonts:
-        try:
-            if os.name == 'nt':
-                font_path = f"C:\\Windows\\Fonts\\{font}.ttf"
-                if os.path.exists(font_path):
-                    break
-        except:
-            continue
-    
-    if font_path and os.path.exists(font_path):
-        prop = fm.FontProperties(fname=font_path)
-        plt.rcParams['font.family'] = prop.get_name()
-    else:
-        plt.rcParams['font.family'] = ['DejaVu Sans', 'Arial', 'Segoe UI', 'sans-serif']
-    
-    plt.rcParams['axes.facecolor'] = 'none'
-    plt.rcParams['figure.facecolor'] = 'none'
+    if os.name == 'nt':
+        for font in chinese_fonts:
+            font_path = f"C:\\Windows\\Fonts\\{font}.ttf"
+            if os.path.exists(font_path):
+                fm.fontManager.addfont(font_path)
+                return [fm.FontProperties(fname=font_path).get_name()]
+    return ['DejaVu Sans', 'Arial', 'Segoe UI', 'sans-serif']
+
+# 样式只在每张图上显式设置，不修改全局 rcParams，多会话并发渲染互不影响
+FONT_FAMILY = find_font_family()
+
+class PlainMinusFormatter(ScalarFormatter):
+    @staticmethod
+    def fix_minus(s):
+        return s
+
+def new_figure(figsize):
+    return Figure(figsize=figsize, facecolor='none')
 
-setup_matplotlib()
+def apply_style(fig):
+    for ax in fig.axes:
+        ax.set_facecolor('none')
+        ax.tick_params(labelfontfamily=FONT_FAMILY)
+        for axis in (ax.xaxis, ax.yaxis):
+            if type(axis.get_major_formatter()) is ScalarFormatter:
+                axis.set_major_formatter(PlainMinusFormatter())
+    for text in fig.findobj(Text):
+        text.set_fontfamily(FONT_FAMILY)
 
-def save_figure(fig, filename):
-    fig.savefig(filename, dpi=300, bbox_inches='tight', transparent=True)
-    plt.close(fig)
+def save_figure(fig, filename, placement, layout_pad=None):
+    apply_style(fig)
+    if layout_pad is not None:
+        fig.tight_layout(pad=layout_pad)
+    fig.savefig(filename, dpi=placement_dpi(fig, placement), bbox_inches='tight', transparent=True)
+    optimize_png(filename)
 
 COLORS = {
     'primary': '#2A6DF4',
@@ -56,7 +69,8 @@ def get_color_variants(base_color, num_variants=5):
 def create_overview_chart(df, output_dir):
     latest_fans = df.sort_values('日期').groupby('账号名称')['粉丝量'].last()
     
-    fig, ax = plt.subplots(figsize=(10, 8))
+    fig = new_figure((10, 8))
+    ax = fig.subplots()
     colors = get_color_variants(COLORS['primary'], len(latest_fans))
     
     wedges, texts, autotexts = ax.pie(
@@ -78,12 +92,13 @@ def create_overview_chart(df, output_dir):
         autotext.set_fontsize(11)
         autotext.set_fontweight('bold')
     
-    save_figure(fig, os.path.join(output_dir, "overview_pie.png"))
+    save_figure(fig, os.path.join(output_dir, "overview_pie.png"), 'overview')
 
 def create_account_detail_charts(df, account_name, output_dir):
     account_df = df[df['账号名称'] == account_name].sort_values('日期')
     
-    fig, (ax1, ax2) = plt.subplots(2, 1, figsize=(14, 10))
+    fig = new_figure((14, 10))
+    ax1, ax2 = fig.subplots(2, 1)
     
     ax1.plot(account_df['日期'], account_df['粉丝量'], color=COLORS['primary'], linewidth=3, marker='o', 
              markersize=8, markerfacecolor='white', markeredgewidth=2, markeredgecolor=COLORS['primary'])
@@ -112,13 +127,13 @@ def create_account_detail_charts(df, account_name, output_dir):
     ax2.grid(True, linestyle='--', color=COLORS['border'], alpha=0.7, axis='y')
     ax2.set_axisbelow(True)
     
-    plt.tight_layout(pad=2.0)
-    save_figure(fig, os.path.join(output_dir, f"detail_{account_name}.png"))
+    save_figure(fig, os.path.join(output_dir, f"detail_{account_name}.png"), 'detail', layout_pad=2.0)
 
 def create_top_posts_chart(df, output_dir):
     top_posts = df.sort_values('互动数', ascending=False).head(10)
     
-    fig, ax = plt.subplots(figsize=(14, 7))
+    fig = new_figure((14, 7))
+    ax = fig.subplots()
     colors = [COLORS['primary'] if i == 0 else COLORS['secondary'] if i < 3 else get_color_variants(COLORS['primary'])[2] for i in range(len(top_posts))]
     bars = ax.barh(range(len(top_posts)), top_posts['互动数'], color=colors, edgecolor='white', linewidth=1, height=0.7)
     
@@ -136,15 +151,15 @@ def create_top_posts_chart(df, output_dir):
     ax.grid(True, linestyle='--', color=COLORS['border'], alpha=0.7, axis='x')
     ax.set_axisbelow(True)
     
-    plt.tight_layout()
-    save_figure(fig, os.path.join(output_dir, "top_posts.png"))
+    save_figure(fig, os.path.join(output_dir, "top_posts.png"), 'top_posts', layout_pad=1.08)
 
 def create_comparison_charts(df, output_dir):
     latest_data = df.sort_values('日期').groupby('账号名称').last().reset_index()
     metrics = ['涨粉量', '互动率', '播放量', '粉丝量']
     titles = ['各账号涨粉对比', '各账号互动率对比', '各账号播放量对比', '各账号粉丝总量对比']
     
-    fig, axes = plt.subplots(2, 2, figsize=(18, 12))
+    fig = new_figure((18, 12))
+    axes = fig.subplots(2, 2)
     axes = axes.flatten()
     colors = get_color_variants(COLORS['primary'], len(latest_data))
     
@@ -164,5 +179,4 @@ def create_comparison_charts(df, output_dir):
                     f'{int(height):,}' if metric != '互动率' else f'{height:.2%}',
                     ha='center', va='bottom', fontweight='bold', fontsize=10)
     
-    plt.tight_layout(pad=2.0)
-    save_figure(fig, os.path.join(output_dir, "comparison.png"))
+    save_figure(fig, os.path.join(output_dir, "comparison.png"), 'comparison', layout_pad=2.0)
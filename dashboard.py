@@ -0,0 +1,91 @@
+import altair as alt
+import pandas as pd
+import streamlit as st
+
+from analytics import daily_frame
+from chart_generator import COLORS
+from metrics import add_metrics
+
+MAX_POINTS = 120
+TOP_POSTS = 10
+TREND_METRICS = ['粉丝量', '涨粉量', '互动数', '互动率']
+COMPARISON_METRICS = ['涨粉量', '互动率', '播放量', '粉丝量']
+
+@st.cache_data(max_entries=16, show_spinner=False)
+def build_aggregates(_df, fingerprint):
+    """预先按账号、日期汇总，并保留每天互动数前 10 的作品作为爆款候选；拖动日期只需切片这些小表。"""
+    daily = daily_frame(_df)
+    posts = add_metrics(_df.copy(), names=['互动数', '互动率'])
+    posts['日期'] = pd.to_datetime(posts['日期'])
+    candidates = (posts.sort_values('互动数', ascending=False, kind='stable')
+                  .groupby('日期', sort=False)
+                  .head(TOP_POSTS)[['日期', '账号名称', '作品标题', '互动数', '互动率']]
+                  .reset_index(drop=True))
+    return daily, candidates
+
+def downsample(daily):
+    if daily['日期'].nunique() <= MAX_POINTS:
+        return daily
+    return (daily.groupby(['账号名称', pd.Grouper(key='日期', freq='W')])
+            .agg(粉丝量=('粉丝量', 'last'), 涨粉量=('涨粉量', 'sum'),
+                 互动数=('互动数', 'sum'), 播放量=('播放量', 'sum'))
+            .reset_index()
+            .pipe(add_metrics, names=['互动率']))
+
+def slice_aggregates(aggregates, start_date, end_date):
+    daily, candidates = aggregates
+    daily = daily[(daily['日期'] >= start_date) & (daily['日期'] <= end_date)]
+    candidates = candidates[(candidates['日期'] >= start_date) & (candidates['日期'] <= end_date)]
+    grouped = daily.groupby('账号名称', sort=False)
+    comparison = grouped.agg(涨粉量=('涨粉量', 'sum'), 互动数=('互动数', 'sum'),
+                             播放量=('播放量', 'sum'), 粉丝量=('粉丝量', 'last')).reset_index()
+    add_metrics(comparison, names=['互动率'])
+    top_posts = candidates.nlargest(TOP_POSTS, '互动数')
+    top_posts = top_posts.assign(作品=[f"{i}. {title[:35]}" for i, title in enumerate(top_posts['作品标题'], 1)])
+    return {
+        'fans': comparison[['账号名称', '粉丝量']],
+        'trends': downsample(daily),
+        'top_posts': top_posts,
+        'comparison': comparison,
+    }
+
+def render_dashboard(aggregates, start_date, end_date):
+    view = slice_aggregates(aggregates, start_date, end_date)
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown("**各账号粉丝占比**")
+        donut = alt.Chart(view['fans']).mark_arc(innerRadius=60, stroke='white').encode(
+            theta=alt.Theta('粉丝量:Q'),
+            color=alt.Color('账号名称:N', legend=alt.Legend(title=None)),
+            tooltip=['账号名称', alt.Tooltip('粉丝量:Q', format=',')]
+        )
+        st.altair_chart(donut, width="stretch")
+    with col2:
+        metric = st.radio("趋势指标", TREND_METRICS, horizontal=True)
+        trend = alt.Chart(view['trends']).mark_line(point=True).encode(
+            x=alt.X('日期:T', title=None),
+            y=alt.Y(f'{metric}:Q', title=metric),
+            color=alt.Color('账号名称:N', legend=alt.Legend(title=None)),
+            tooltip=['账号名称', alt.Tooltip('日期:T', format='%Y-%m-%d'), alt.Tooltip(f'{metric}:Q', format='.2%' if metric == '互动率' else ',')]
+        ).interactive(bind_y=False)
+        st.altair_chart(trend, width="stretch")
+
+    col1, col2 = st.columns(2)
+    with col1:
+        st.markdown(f"**Top {TOP_POSTS} 爆款作品（按互动量）**")
+        top = alt.Chart(view['top_posts']).mark_bar(color=COLORS['primary']).encode(
+            x=alt.X('互动数:Q'),
+            y=alt.Y('作品:N', sort=None, title=None, axis=alt.Axis(labelLimit=240)),
+            tooltip=['作品标题', '账号名称', alt.Tooltip('日期:T', format='%Y-%m-%d'),
+                     alt.Tooltip('互动数:Q', format=','), alt.Tooltip('互动率:Q', format='.2%')]
+        )
+        st.altair_chart(top, width="stretch")
+    with col2:
+        metric = st.selectbox("对比指标", COMPARISON_METRICS)
+        comparison = alt.Chart(view['comparison']).mark_bar(color=COLORS['secondary']).encode(
+            x=alt.X('账号名称:N', sort='-y', title=None),
+            y=alt.Y(f'{metric}:Q', title=metric, axis=alt.Axis(format='%' if metric == '互动率' else ',')),
+            tooltip=['账号名称', alt.Tooltip(f'{metric}:Q', format='.2%' if metric == '互动率' else ',')]
+        )
+        st.altair_chart(comparison, width="stretch")
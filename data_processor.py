@@ -2,6 +2,8 @@ import pandas as pd
 import numpy as np
 from datetime import datetime, timedelta
 
+from metrics import add_metrics
+
 def generate_sample_data():
     account_names = [
         "美食探店达人", "旅行记录家", "职场小能手", 
@@ -44,9 +46,7 @@ def generate_sample_data():
             base_followers = daily_followers
     
     df = pd.DataFrame(data)
-    df["互动数"] = df["点赞数"] + df["评论数"] + df["收藏数"]
-    df["互动率"] = df["互动数"] / df["播放量"].replace(0, 1)
-    return df
+    return add_metrics(df)
 
 def load_data(file):
     if file.name.endswith('.xlsx'):
@@ -64,6 +64,4 @@ def map_columns(df, column_mapping):
     for col in required_cols:
         if col not in df.columns:
             raise ValueError(f"缺少必要列: {col}")
-    df["互动数"] = df["点赞数"] + df["评论数"] + df["收藏数"]
-    df["互动率"] = df["互动数"] / df["播放量"].replace(0, 1)
-    return df
+    return add_metrics(df, refresh=True)
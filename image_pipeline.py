@@ -0,0 +1,25 @@
+from PIL import Image
+
+TARGET_DPI = 200
+MAX_COLORS = 256
+
+# 各图表在 PPT 中的放置高度（英寸），渲染分辨率按此计算
+PLACEMENTS = {
+    'overview': 3.5,
+    'detail': 5.8,
+    'top_posts': 2.8,
+    'comparison': 5.8,
+}
+
+def placement_dpi(fig, placement, target_dpi=TARGET_DPI):
+    fig_height = fig.get_size_inches()[1]
+    return target_dpi * PLACEMENTS[placement] / fig_height
+
+def optimize_png(path, quantize=True, max_colors=MAX_COLORS):
+    with Image.open(path) as img:
+        img.load()
+    if quantize:
+        if img.mode not in ('RGB', 'RGBA'):
+            img = img.convert('RGBA')
+        img = img.quantize(colors=max_colors, method=Image.Quantize.FASTOCTREE)
+    img.save(path, format='PNG', optimize=True)
@@ -0,0 +1,127 @@
+import ast
+import re
+
+NAME_PATTERN = re.compile(r"`([^`]+)`|([^\W\d]\w*)")
+
+# 指标以表达式声明（pandas.eval 语法），按需一次性向量化计算
+METRICS = {}
+
+DEFAULT_METRICS = ('互动数', '互动率')
+
+# 表达式只允许列名、数值常量和算术/比较/逻辑运算；属性访问、调用、下标、字符串等一律拒绝
+ALLOWED_NODES = (
+    ast.Expression, ast.Name, ast.Load, ast.Constant, ast.BinOp, ast.UnaryOp, ast.Compare, ast.BoolOp,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow, ast.BitAnd, ast.BitOr,
+    ast.UAdd, ast.USub, ast.Not, ast.Invert, ast.And, ast.Or,
+    ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE,
+)
+# pandas.eval 会在 Python 中预先折叠纯常量子表达式，需限制常量大小和乘方，避免超大整数运算阻塞进程
+MAX_CONSTANT = 10 ** 12
+MAX_EXPONENT = 10
+
+def has_name(node):
+    return any(isinstance(child, ast.Name) for child in ast.walk(node))
+
+def literal_value(node):
+    if isinstance(node, ast.UnaryOp) and isinstance(node.op, (ast.UAdd, ast.USub)):
+        node = node.operand
+    return node.value if isinstance(node, ast.Constant) else None
+
+def validate_expression(expression):
+    quoted = {}
+
+    def placeholder(match):
+        if match.group(1) is None:
+            return match.group(0)
+        return quoted.setdefault(match.group(1), f"_quoted_{len(quoted)}")
+
+    try:
+        tree = ast.parse(NAME_PATTERN.sub(placeholder, expression.strip()), mode='eval')
+    except SyntaxError:
+        raise ValueError(f"指标表达式语法错误: {expression}")
+    original = {placeholder: name for name, placeholder in quoted.items()}
+    names = set()
+    for node in ast.walk(tree):
+        if not isinstance(node, ALLOWED_NODES):
+            raise ValueError(f"指标表达式包含不允许的语法（{type(node).__name__}）: {expression}")
+        if isinstance(node, ast.Constant) and type(node.value) not in (int, float):
+            raise ValueError(f"指标表达式只允许数值常量: {expression}")
+        if isinstance(node, ast.Constant) and not abs(node.value) <= MAX_CONSTANT:
+            raise ValueError(f"指标表达式中的常量超出范围（不超过 {MAX_CONSTANT:.0e}）: {expression}")
+        if isinstance(node, ast.BinOp) and isinstance(node.op, ast.Pow):
+            exponent = literal_value(node.right)
+            if not has_name(node.left) or exponent is None or abs(exponent) > MAX_EXPONENT:
+                raise ValueError(f"乘方只允许对列或指标使用不超过 {MAX_EXPONENT} 的数值指数: {expression}")
+        if isinstance(node, ast.Name):
+            names.add(original.get(node.id, node.id))
+    return names
+
+def register_metric(name, expression, registry=None):
+    if not name.isidentifier():
+        raise ValueError(f"指标名称不合法: {name}")
+    validate_expression(expression)
+    (METRICS if registry is None else registry)[name] = expression.strip()
+
+register_metric('互动数', '点赞数 + 评论数 + 收藏数')
+register_metric('互动率', '互动数 / (播放量 + (播放量 == 0))')
+register_metric('总互动数', '点赞数 + 评论数 + 收藏数 + 分享数')
+register_metric('千次播放分享数', '分享数 * 1000 / (播放量 + (播放量 == 0))')
+register_metric('涨粉转化率', '涨粉量 / (播放量 + (播放量 == 0))')
+
+def parse_metric_definitions(text):
+    definitions = {}
+    for line in text.splitlines():
+        line = line.strip()
+        if not line or line.startswith('#'):
+            continue
+        name, sep, expression = line.partition('=')
+        if not sep or not expression.strip():
+            raise ValueError(f"指标定义格式应为「名称 = 表达式」: {line}")
+        if name.strip() in METRICS:
+            raise ValueError(f"自定义指标不能与内置指标重名: {name.strip()}")
+        register_metric(name.strip(), expression, registry=definitions)
+    return definitions
+
+def metric_dependencies(expression, registry):
+    return [name for name in validate_expression(expression) if name in registry]
+
+def resolve_metrics(names, registry, available=()):
+    order = []
+    visiting = set()
+
+    def visit(name):
+        if name in order or name in available:
+            return
+        if name in visiting:
+            raise ValueError(f"指标存在循环依赖: {name}")
+        if name not in registry:
+            raise ValueError(f"未定义的指标: {name}")
+        visiting.add(name)
+        for dep in metric_dependencies(registry[name], registry):
+            if dep != name:
+                visit(dep)
+        visiting.discard(name)
+        order.append(name)
+
+    for name in names:
+        visit(name)
+    return order
+
+def add_metrics(df, names=None, definitions=None, refresh=False):
+    """在 df 上原地补齐所需指标列；已存在的列视为缓存不再重复计算。"""
+    registry = {**METRICS, **(definitions or {})}
+    if names is None:
+        names = list(DEFAULT_METRICS) + [name for name in (definitions or {}) if name not in DEFAULT_METRICS]
+    clashes = [name for name in (definitions or {}) if name in df.columns]
+    if clashes and not refresh:
+        raise ValueError(f"自定义指标与数据列重名: {'、'.join(clashes)}")
+    available = () if refresh else set(df.columns)
+    order = resolve_metrics(names, registry, available)
+    known = set(df.columns) | set(registry)
+    for name in order:
+        unknown = validate_expression(registry[name]) - known
+        if unknown:
+            raise ValueError(f"指标「{name}」引用了不存在的列: {'、'.join(sorted(unknown))}")
+    if order:
+        df.eval("\n".join(f"{name} = {registry[name]}" for name in order), inplace=True)
+    return df
@@ -0,0 +1,81 @@
+import os
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+from chart_generator import (
+    create_overview_chart,
+    create_account_detail_charts,
+    create_top_posts_chart,
+    create_comparison_charts
+)
+from analytics import summarize
+from metrics import add_metrics
+from report_builder import start_ppt, place_chart, save_ppt, build_word
+
+MAX_WORKERS = min(4, os.cpu_count() or 1)
+
+class Stage:
+    def __init__(self, name, func, deps=(), on_main_thread=False):
+        self.name = name
+        self.func = func
+        self.deps = tuple(deps)
+        self.on_main_thread = on_main_thread
+
+def run_stages(stages, max_workers=MAX_WORKERS, on_stage_done=None):
+    """按依赖关系执行各阶段：互不依赖的阶段并发运行，on_main_thread 的阶段在调用线程中串行执行。"""
+    pending = {stage.name: stage for stage in stages}
+    results = {}
+    running = {}
+
+    def finish(name, result):
+        results[name] = result
+        if on_stage_done is not None:
+            on_stage_done(name, len(results), len(stages))
+
+    with ThreadPoolExecutor(max_workers=max_workers) as pool:
+        while pending or running:
+            ready = [stage for stage in pending.values() if all(dep in results for dep in stage.deps)]
+            for stage in ready:
+                del pending[stage.name]
+            for stage in ready:
+                if not stage.on_main_thread:
+                    future = pool.submit(stage.func, *[results[dep] for dep in stage.deps])
+                    running[future] = stage.name
+            main_stages = [stage for stage in ready if stage.on_main_thread]
+            for stage in main_stages:
+                finish(stage.name, stage.func(*[results[dep] for dep in stage.deps]))
+            if main_stages:
+                continue
+            if not running:
+                raise ValueError(f"无法调度的阶段（依赖缺失或存在环）: {', '.join(pending)}")
+            done, _ = wait(running, return_when=FIRST_COMPLETED)
+            for future in done:
+                finish(running.pop(future), future.result())
+    return results
+
+def report_stages(df, output_dir):
+    # 汇总 → 图表 → PPT 页面；汇总 → 分析 → PPT/Word。python-pptx 不是线程安全的，PPT 阶段都放在主线程
+    charts = {
+        'overview_pie.png': lambda data: create_overview_chart(data, output_dir),
+        'top_posts.png': lambda data: create_top_posts_chart(data, output_dir),
+        'comparison.png': lambda data: create_comparison_charts(data, output_dir),
+    }
+    for account in df['账号名称'].unique():
+        charts[f"detail_{account}.png"] = lambda data, account=account: create_account_detail_charts(data, account, output_dir)
+
+    stages = [
+        Stage('aggregates', lambda: add_metrics(df.sort_values('日期', kind='stable'))),
+        Stage('analytics', summarize, deps=['aggregates']),
+        Stage('ppt:start', start_ppt, deps=['aggregates', 'analytics'], on_main_thread=True),
+        Stage('word', lambda data, summary: build_word(data, output_dir, summary_text=summary), deps=['aggregates', 'analytics']),
+    ]
+    for filename, render in charts.items():
+        stages.append(Stage(f"chart:{filename}", render, deps=['aggregates']))
+        stages.append(Stage(f"slide:{filename}", lambda deck, _, filename=filename: place_chart(deck, output_dir, filename),
+                            deps=['ppt:start', f"chart:{filename}"], on_main_thread=True))
+    stages.append(Stage('ppt', lambda deck, *_: save_ppt(deck, output_dir),
+                        deps=['ppt:start'] + [f"slide:{filename}" for filename in charts], on_main_thread=True))
+    return stages
+
+def generate_reports(df, output_dir, on_stage_done=None):
+    results = run_stages(report_stages(df, output_dir), on_stage_done=on_stage_done)
+    return results['ppt'], results['word']
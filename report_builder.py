@@ -8,6 +8,9 @@ import pandas as pd
 import os
 from datetime import datetime
 
+from image_pipeline import PLACEMENTS
+from analytics import summarize
+
 COLORS = {
     'primary': RGBColor(42, 109, 244),
     'primary_hex': '#2A6DF4',
@@ -52,8 +55,9 @@ def set_font(run, size=18, bold=False, color=None):
     if color:
         run.font.color.rgb = color
 
-def build_ppt(df, output_dir, output_file="report.pptx"):
+def start_ppt(df, summary_text=None):
     prs = Presentation()
+    slots = {}
     prs.slide_width = Inches(10)
     prs.slide_height = Inches(7.5)
 
@@ -160,7 +164,7 @@ def build_ppt(df, output_dir, output_file="report.pptx"):
     kpis = [
         ("👥 总粉丝", f"{total_fans:,}"),
         ("📈 总涨粉", f"{df['涨粉量'].sum():,}"),
-        ("❤️ 总互动", f"{(df['点赞数'] + df['评论数'] + df['收藏数']).sum():,}")
+        ("❤️ 总互动", f"{df['互动数'].sum():,}")
     ]
     
     for i, (label, value) in enumerate(kpis):
@@ -192,9 +196,7 @@ def build_ppt(df, output_dir, output_file="report.pptx"):
         p.alignment = PP_ALIGN.CENTER
         set_font(p.runs[0], size=36, bold=True, color=COLORS['primary'])
 
-    img_path = os.path.join(output_dir, "overview_pie.png")
-    if os.path.exists(img_path):
-        slide.shapes.add_picture(img_path, Inches(1), Inches(3.5), height=Inches(3.5))
+    slots["overview_pie.png"] = (slide, Inches(1), Inches(3.5), Inches(PLACEMENTS['overview']))
 
     accounts = df['账号名称'].unique()
     for account in accounts:
@@ -216,9 +218,7 @@ def build_ppt(df, output_dir, output_file="report.pptx"):
         p.text = f"账号详情 - {account}"
         set_font(p.runs[0], size=32, bold=True, color=COLORS['primary'])
 
-        img_path = os.path.join(output_dir, f"detail_{account}.png")
-        if os.path.exists(img_path):
-            slide.shapes.add_picture(img_path, Inches(0.5), Inches(1.3), height=Inches(5.8))
+        slots[f"detail_{account}.png"] = (slide, Inches(0.5), Inches(1.3), Inches(PLACEMENTS['detail']))
 
     slide_layout = prs.slide_layouts[5]
     slide = prs.slides.add_slide(slide_layout)
@@ -238,9 +238,7 @@ def build_ppt(df, output_dir, output_file="report.pptx"):
     p.text = "爆款作品"
     set_font(p.runs[0], size=32, bold=True, color=COLORS['primary'])
 
-    img_path = os.path.join(output_dir, "top_posts.png")
-    if os.path.exists(img_path):
-        slide.shapes.add_picture(img_path, Inches(0.3), Inches(1.3), height=Inches(2.8))
+    slots["top_posts.png"] = (slide, Inches(0.3), Inches(1.3), Inches(PLACEMENTS['top_posts']))
 
     top_posts = df.sort_values('互动数', ascending=False).head(10)
     table = slide.shapes.add_table(11, 4, Inches(0.5), Inches(4.3), Inches(9), Inches(2.8)).table
@@ -297,9 +295,7 @@ def build_ppt(df, output_dir, output_file="report.pptx"):
     p.text = "账号对比"
     set_font(p.runs[0], size=32, bold=True, color=COLORS['primary'])
 
-    img_path = os.path.join(output_dir, "comparison.png")
-    if os.path.exists(img_path):
-        slide.shapes.add_picture(img_path, Inches(0.3), Inches(1.3), height=Inches(5.8))
+    slots["comparison.png"] = (slide, Inches(0.3), Inches(1.3), Inches(PLACEMENTS['comparison']))
 
     left = Inches(1)
     top = Inches(7.2)
@@ -338,21 +334,8 @@ def build_ppt(df, output_dir, output_file="report.pptx"):
     text_frame = content.text_frame
     text_frame.word_wrap = True
 
-    summary_text = """【亮点】
-1. 整体粉丝增长趋势良好，各账号均有稳定表现
-2. 爆款作品互动率突出，内容质量得到用户认可
-3. 账号矩阵布局合理，覆盖多个垂直领域
-
-【问题】
-1. 部分账号涨粉波动较大，稳定性有待提升
-2. 评论互动率相对较低，需加强用户引导
-3. 内容发布频率不均衡，建议优化发布策略
-
-【建议】
-1. 针对爆款作品内容特点，持续产出同类型优质内容
-2. 增加评论区互动，积极回复用户留言
-3. 制定固定发布计划，保持内容更新频率"""
-
+    if summary_text is None:
+        summary_text = summarize(df)
     lines = summary_text.split('\n')
     for i, line in enumerate(lines):
         if i == 0:
@@ -360,6 +343,8 @@ def build_ppt(df, output_dir, output_file="report.pptx"):
         else:
             p = text_frame.add_paragraph()
         p.text = line
+        if not line:
+            continue
         if line.startswith('【'):
             set_font(p.runs[0], size=18, bold=True, color=COLORS['primary'])
             p.space_before = Pt(12)
@@ -367,11 +352,26 @@ def build_ppt(df, output_dir, output_file="report.pptx"):
             set_font(p.runs[0], size=16, color=COLORS['text_secondary'])
         p.space_after = Pt(6)
 
+    return {'prs': prs, 'slots': slots}
+
+def place_chart(deck, output_dir, filename):
+    slide, left, top, height = deck['slots'][filename]
+    img_path = os.path.join(output_dir, filename)
+    if os.path.exists(img_path):
+        slide.shapes.add_picture(img_path, left, top, height=height)
+
+def save_ppt(deck, output_dir, output_file="report.pptx"):
     output_path = os.path.join(output_dir, output_file)
-    prs.save(output_path)
+    deck['prs'].save(output_path)
     return output_path
 
-def build_word(df, output_dir, output_file="report.docx"):
+def build_ppt(df, output_dir, output_file="report.pptx", summary_text=None):
+    deck = start_ppt(df, summary_text)
+    for filename in deck['slots']:
+        place_chart(deck, output_dir, filename)
+    return save_ppt(deck, output_dir, output_file)
+
+def build_word(df, output_dir, output_file="report.docx", summary_text=None):
     doc = Document()
     doc.add_heading('抖音运营月度分析报告', 0)
     doc.add_paragraph(f"报告期间：{df['日期'].min()} 至 {df['日期'].max()}")
@@ -403,22 +403,8 @@ def build_word(df, output_dir, output_file="report.docx"):
         row_cells[3].text = f"{post['互动率']:.2%}"
     
     doc.add_heading('建议与总结', level=1)
-    summary_text = """
-【亮点】
-1. 整体粉丝增长趋势良好，各账号均有稳定表现
-2. 爆款作品互动率突出，内容质量得到用户认可
-3. 账号矩阵布局合理，覆盖多个垂直领域
-
-【问题】
-1. 部分账号涨粉波动较大，稳定性有待提升
-2. 评论互动率相对较低，需加强用户引导
-3. 内容发布频率不均衡，建议优化发布策略
-
-【建议】
-1. 针对爆款作品内容特点，持续产出同类型优质内容
-2. 增加评论区互动，积极回复用户留言
-3. 制定固定发布计划，保持内容更新频率
-    """
+    if summary_text is None:
+        summary_text = summarize(df)
     doc.add_paragraph(summary_text.strip())
     
     output_path = os.path.join(output_dir, output_file)
@@ -0,0 +1,245 @@
+import os
+import shutil
+import tempfile
+import threading
+import time
+import uuid
+
+import pandas as pd
+
+from artifact_cache import data_fingerprint, dir_size
+
+SESSION_DIR = os.path.join(tempfile.gettempdir(), 'douyin_report_sessions')
+SESSION_MEMORY_BUDGET = 256 * 1024 * 1024
+GLOBAL_MEMORY_BUDGET = 1024 * 1024 * 1024
+SESSION_DISK_BUDGET = 200 * 1024 * 1024
+GLOBAL_DISK_BUDGET = 2 * 1024 * 1024 * 1024
+IDLE_SPILL_SECONDS = 300
+SESSION_TTL = 3600
+SWEEP_INTERVAL = 60
+
+def columnar_frame(df):
+    """Excel 中常见数字与文本混排的列，写 Parquet 前统一转成字符串（保留空值）。"""
+    mixed = [col for col in df.columns
+             if df[col].dtype == object and pd.api.types.infer_dtype(df[col], skipna=True).startswith('mixed')]
+    if not mixed:
+        return df
+    df = df.copy(deep=False)
+    for col in mixed:
+        df[col] = df[col].map(str).where(df[col].notna())
+    return df
+
+class SessionResources:
+    def __init__(self, root):
+        self.root = root
+        self.df = None
+        self.df_path = None
+        self.df_bytes = 0
+        self.fingerprint = None
+        self.spill_bytes = 0
+        self.artifact_bytes = 0
+        self.spill_error = None
+        self.last_access = time.time()
+
+    @property
+    def output_dir(self):
+        return os.path.join(self.root, 'artifacts')
+
+    @property
+    def disk_bytes(self):
+        return self.spill_bytes + self.artifact_bytes
+
+class SessionResourceManager:
+    """管理各会话的 DataFrame 与临时产物，按会话和全局预算回收内存与磁盘。
+
+    占用量在写入时累计，不在请求路径上遍历目录；回收只由 start_janitor() 的后台线程执行。
+    """
+
+    def __init__(self, root=SESSION_DIR, session_exists=None,
+                 session_memory_budget=SESSION_MEMORY_BUDGET, global_memory_budget=GLOBAL_MEMORY_BUDGET,
+                 session_disk_budget=SESSION_DISK_BUDGET, global_disk_budget=GLOBAL_DISK_BUDGET,
+                 idle_spill_seconds=IDLE_SPILL_SECONDS, session_ttl=SESSION_TTL):
+        self.root = root
+        self.session_exists = session_exists or (lambda session_id: True)
+        self.session_memory_budget = session_memory_budget
+        self.global_memory_budget = global_memory_budget
+        self.session_disk_budget = session_disk_budget
+        self.global_disk_budget = global_disk_budget
+        self.idle_spill_seconds = idle_spill_seconds
+        self.session_ttl = session_ttl
+        self._sessions = {}
+        self._lock = threading.Lock()
+        os.makedirs(root, exist_ok=True)
+
+    def _session(self, session_id):
+        resources = self._sessions.get(session_id)
+        if resources is None:
+            resources = SessionResources(os.path.join(self.root, session_id))
+            self._sessions[session_id] = resources
+        resources.last_access = time.time()
+        return resources
+
+    def _spill(self, resources):
+        with self._lock:
+            df = resources.df
+        if df is None:
+            return
+        os.makedirs(resources.root, exist_ok=True)
+        path = os.path.join(resources.root, f"data-{uuid.uuid4().hex}.parquet")
+        try:
+            columnar_frame(df).to_parquet(path)
+        except Exception as e:
+            if os.path.exists(path):
+                os.remove(path)
+            with self._lock:
+                resources.spill_error = f"{type(e).__name__}: {e}"
+            return
+        with self._lock:
+            if resources.df is df:
+                resources.spill_error = None
+                resources.df = None
+                resources.df_path = path
+                resources.spill_bytes = os.path.getsize(path)
+                return
+        # 写盘期间数据已被替换
+        os.remove(path)
+
+    def _clear_artifacts(self, resources):
+        shutil.rmtree(resources.output_dir, ignore_errors=True)
+        with self._lock:
+            resources.artifact_bytes = 0
+
+    def set_df(self, session_id, df):
+        df_bytes = int(df.memory_usage(deep=True).sum())
+        fingerprint = data_fingerprint(df)
+        with self._lock:
+            resources = self._session(session_id)
+            stale_path = resources.df_path
+            resources.df = df
+            resources.df_path = None
+            resources.df_bytes = df_bytes
+            resources.fingerprint = fingerprint
+            resources.spill_bytes = 0
+        if stale_path is not None and os.path.exists(stale_path):
+            os.remove(stale_path)
+        if df_bytes > self.session_memory_budget:
+            self._spill(resources)
+
+    def get_df(self, session_id):
+        with self._lock:
+            resources = self._session(session_id)
+            if resources.df is not None or resources.df_path is None:
+                return resources.df
+            df_path = resources.df_path
+            keep_in_memory = resources.df_bytes <= self.session_memory_budget
+        df = pd.read_parquet(df_path)
+        if keep_in_memory:
+            with self._lock:
+                if resources.df_path != df_path:
+                    return df
+                resources.df = df
+                resources.df_path = None
+                resources.spill_bytes = 0
+            os.remove(df_path)
+        return df
+
+    def has_df(self, session_id):
+        with self._lock:
+            resources = self._session(session_id)
+            return resources.df is not None or resources.df_path is not None
+
+    def fingerprint(self, session_id):
+        with self._lock:
+            return self._session(session_id).fingerprint
+
+    def output_dir(self, session_id):
+        with self._lock:
+            resources = self._session(session_id)
+        os.makedirs(resources.output_dir, exist_ok=True)
+        return resources.output_dir
+
+    def record_artifacts(self, session_id):
+        with self._lock:
+            resources = self._session(session_id)
+        artifact_bytes = dir_size(resources.output_dir)
+        if artifact_bytes > self.session_disk_budget:
+            self._clear_artifacts(resources)
+            return
+        with self._lock:
+            resources.artifact_bytes = artifact_bytes
+
+    def release(self, session_id):
+        with self._lock:
+            resources = self._sessions.pop(session_id, None)
+        root = resources.root if resources else os.path.join(self.root, session_id)
+        shutil.rmtree(root, ignore_errors=True)
+
+    def sweep(self):
+        now = time.time()
+        with self._lock:
+            sessions = list(self._sessions.items())
+        # 断线的会话在 Streamlit 中仍可重连，只有超过 TTL 或已被 Streamlit 移除时才释放
+        expired = [session_id for session_id, resources in sessions
+                   if now - resources.last_access > self.session_ttl or not self.session_exists(session_id)]
+        for session_id in expired:
+            self.release(session_id)
+
+        with self._lock:
+            by_lru = sorted(self._sessions.values(), key=lambda r: r.last_access)
+            idle = [r for r in by_lru if r.df is not None and now - r.last_access > self.idle_spill_seconds]
+        for resources in idle:
+            self._spill(resources)
+
+        with self._lock:
+            in_memory = [r for r in by_lru if r.df is not None]
+            memory = sum(r.df_bytes for r in in_memory)
+        for resources in in_memory:
+            if memory <= self.global_memory_budget:
+                break
+            self._spill(resources)
+            if resources.df is None:
+                memory -= resources.df_bytes
+
+        with self._lock:
+            disk = sum(r.disk_bytes for r in by_lru)
+            with_artifacts = [(r, r.artifact_bytes) for r in by_lru if r.artifact_bytes]
+        for resources, artifact_bytes in with_artifacts:
+            if disk <= self.global_disk_budget:
+                break
+            self._clear_artifacts(resources)
+            disk -= artifact_bytes
+
+        with self._lock:
+            known = {os.path.basename(r.root) for r in self._sessions.values()}
+        for name in os.listdir(self.root):
+            path = os.path.join(self.root, name)
+            try:
+                if name not in known and now - os.path.getmtime(path) > self.session_ttl:
+                    shutil.rmtree(path, ignore_errors=True)
+            except OSError:
+                continue
+
+    def start_janitor(self, interval=SWEEP_INTERVAL):
+        def run():
+            while True:
+                time.sleep(interval)
+                try:
+                    self.sweep()
+                except Exception:
+                    continue
+        thread = threading.Thread(target=run, name='session-janitor', daemon=True)
+        thread.start()
+        return thread
+
+    def usage(self):
+        with self._lock:
+            sessions = list(self._sessions.values())
+            return {
+                'sessions': len(sessions),
+                'spilled': sum(1 for r in sessions if r.df_path is not None),
+                'spill_errors': [r.spill_error for r in sessions if r.spill_error and r.df is not None],
+                'memory_bytes': sum(r.df_bytes for r in sessions if r.df is not None),
+                'disk_bytes': sum(r.disk_bytes for r in sessions),
+                'memory_budget': self.global_memory_budget,
+                'disk_budget': self.global_disk_budget,
+            }
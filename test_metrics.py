@@ -0,0 +1,66 @@
+import os
+
+import pandas as pd
+import pytest
+
+from metrics import add_metrics, parse_metric_definitions
+
+
+def sample_frame():
+    return pd.DataFrame({
+        '点赞数': [10, 20], '评论数': [1, 2], '收藏数': [3, 4],
+        '分享数': [5, 6], '涨粉量': [7, 8], '播放量': [1000, 0],
+    })
+
+
+def test_default_metrics():
+    df = add_metrics(sample_frame())
+    assert df['互动数'].tolist() == [14, 26]
+    assert df['互动率'].tolist() == [0.014, 26.0]
+
+
+def test_custom_metric_with_quoted_name_and_exponent():
+    definitions = parse_metric_definitions("千次播放分享 = `分享数` * 1e3 / (播放量 + (播放量 == 0))")
+    df = add_metrics(sample_frame(), definitions=definitions)
+    assert df['千次播放分享'].tolist() == [5.0, 6000.0]
+
+
+def test_custom_metric_with_small_power():
+    definitions = parse_metric_definitions("播放量平方 = 播放量 ** 2")
+    assert add_metrics(sample_frame(), definitions=definitions)['播放量平方'].tolist() == [1000000, 0]
+
+
+@pytest.mark.parametrize('expression', [
+    "播放量.to_csv('{path}')",
+    "播放量.to_pickle('{path}')",
+    "播放量.sum()",
+    "播放量[0]",
+    "'abc'",
+    "@播放量",
+    "播放量 @ 播放量",
+    "__import__('os')",
+    "播放量 * (9 ** 9 ** 9 ** 9)",
+    "播放量 ** 播放量 ** 999",
+    "播放量 * 10 ** 100",
+    "播放量 * 99999999999999999999",
+])
+def test_rejects_unsafe_expressions(tmp_path, expression):
+    path = tmp_path / 'pwn'
+    with pytest.raises(ValueError):
+        definitions = parse_metric_definitions(f"x = {expression.format(path=path)}")
+        add_metrics(sample_frame(), definitions=definitions)
+    assert not os.listdir(tmp_path)
+
+
+def test_rejects_unknown_names():
+    definitions = parse_metric_definitions("x = 播放量 + df")
+    with pytest.raises(ValueError):
+        add_metrics(sample_frame(), definitions=definitions)
+
+
+def test_rejects_name_clashes():
+    with pytest.raises(ValueError):
+        parse_metric_definitions("互动数 = 点赞数 * 100")
+    definitions = parse_metric_definitions("点赞数 = 评论数 * 100")
+    with pytest.raises(ValueError):
+        add_metrics(sample_frame(), definitions=definitions)